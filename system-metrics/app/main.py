@@ -1,41 +1,175 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import math
+import os
 import re
+import secrets
+import select
+import shlex
+import signal
 import subprocess
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 
 HOST_ROOT = Path("/host")
+HOST_COMMAND_TIMEOUT = 5
+METRICS_MAX_AGE = 5
+
+# Single-pass scans that only capture the keys the parsers actually use
+_LSCPU_RE = re.compile(
+    r"^(Model name|Model|CPU\(s\)|Socket\(s\)|Thread\(s\) per core)[ \t]*:[ \t]*(.*?)[ \t]*$",
+    re.MULTILINE,
+)
+_CPUINFO_RE = re.compile(
+    r"^(processor|model name|physical id|siblings|cpu cores)[ \t]*:[ \t]*(.*?)[ \t]*$",
+    re.MULTILINE,
+)
+
+SKIPPED_IFACE_PREFIXES = ("lo", "docker", "br-", "veth", "tun")
 
 app = FastAPI(title="System Metrics Service", version="1.0.0")
 
+# Resolved host paths by executable name, see resolve_host_executable
+_host_executables: Dict[str, str] = {}
+
+# Long-lived `chroot HOST_ROOT /bin/sh` that host commands are piped through
+_host_shell: Optional[subprocess.Popen] = None
+_host_shell_lock = threading.Lock()
+
+# Host facts from gather_static_metrics, set once all of them were collected
+STATIC_METRIC_KEYS = ("hostname", "operating_system", "cpu")
+_static_metrics: Optional[Dict[str, Any]] = None
+
+# (expires_at, etag, payload) per endpoint, see cached_payload
+_metrics_cache: Dict[str, Tuple[float, str, Dict[str, Any]]] = {}
+# Created lazily so they bind to the running event loop
+_metrics_cache_locks: Dict[str, asyncio.Lock] = {}
+
+
+def resolve_host_executable(executable: str) -> Optional[str]:
+    """Locate an executable on the host root, caching paths that were found."""
+    resolved = _host_executables.get(executable)
+    if resolved is not None:
+        return resolved
+    if HOST_ROOT.joinpath(executable.lstrip("/")).exists():
+        resolved = executable
+    elif HOST_ROOT.joinpath("usr/bin", executable).exists():
+        resolved = f"/usr/bin/{executable}"
+    else:
+        # Not cached: the host root may not be readable yet
+        return None
+    _host_executables[executable] = resolved
+    return resolved
 
-def run_host_command(command: List[str]) -> Optional[str]:
-    """Execute a host command through the mounted root using chroot."""
-    executable = command[0]
-
-    # resolve binary location on host
-    if not HOST_ROOT.joinpath(executable.lstrip("/")).exists():
-        candidate = HOST_ROOT / "usr/bin" / executable
-        if candidate.exists():
-            command = [f"/usr/bin/{executable}"] + command[1:]
-        else:
-            return None
 
+def start_host_shell() -> Optional[subprocess.Popen]:
+    shell = resolve_host_executable("/bin/sh")
+    if shell is None:
+        return None
     try:
-        completed = subprocess.run(
-            ["chroot", str(HOST_ROOT), *command],
-            check=True,
+        return subprocess.Popen(
+            ["chroot", str(HOST_ROOT), shell],
+            stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=5,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+            start_new_session=True,
         )
-        return completed.stdout.strip()
-    except (FileNotFoundError, subprocess.SubprocessError, subprocess.TimeoutExpired):
+    except OSError:
+        return None
+
+
+def stop_host_shell() -> None:
+    global _host_shell
+    if _host_shell is None:
+        return
+    try:
+        # Kill the whole session so a hung command does not outlive its shell
+        os.killpg(_host_shell.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    _host_shell.wait()
+    _host_shell = None
+
+
+def host_shell_exchange(
+    shell: subprocess.Popen, command_line: str
+) -> Optional[Tuple[bytes, int]]:
+    """Run a command line in the host shell and return (stdout, exit status).
+
+    The reply is framed by a per-call random token so command output cannot
+    be mistaken for the trailer. None means the exchange failed and the shell
+    is out of sync.
+    """
+    token = secrets.token_hex(16)
+    script = (
+        f"{command_line} </dev/null 2>/dev/null; "
+        f"printf '\\0%s %s\\0' {token} \"$?\"\n"
+    )
+    try:
+        shell.stdin.write(script.encode())
+    except OSError:
+        return None
+
+    # Reply layout: <stdout> NUL <token> SP <exit status> NUL
+    marker = f"\0{token} ".encode()
+    fd = shell.stdout.fileno()
+    deadline = time.monotonic() + HOST_COMMAND_TIMEOUT
+    reply = b""
+    while True:
+        index = reply.rfind(marker)
+        if index != -1 and reply.endswith(b"\0") and len(reply) > index + len(marker):
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if not ready:
+            return None
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return None
+        reply += chunk
+
+    status = reply[index + len(marker) : -1]
+    if not status.isdigit():
         return None
+    return reply[:index], int(status)
+
+
+def run_host_command(command: List[str]) -> Optional[str]:
+    """Execute a host command through the persistent chroot'd host shell."""
+    global _host_shell
+    executable = resolve_host_executable(command[0])
+    if executable is None:
+        return None
+    command_line = shlex.join([executable, *command[1:]])
+
+    with _host_shell_lock:
+        if _host_shell is None or _host_shell.poll() is not None:
+            _host_shell = start_host_shell()
+            if _host_shell is None:
+                return None
+        reply = host_shell_exchange(_host_shell, command_line)
+        if reply is None:
+            # Timed out, the shell died or the reply was malformed; start a
+            # fresh shell on the next call
+            stop_host_shell()
+            return None
+
+    output, status = reply
+    if status != 0:
+        return None
+    return output.decode(errors="replace").strip()
 
 
 def read_os_release() -> Optional[str]:
@@ -44,10 +178,9 @@ def read_os_release() -> Optional[str]:
         return None
     data: Dict[str, str] = {}
     for line in os_release_path.read_text().splitlines():
-        if "=" not in line:
-            continue
-        key, value = line.split("=", 1)
-        data[key.strip()] = value.strip().strip('"')
+        key, sep, value = line.partition("=")
+        if sep:
+            data[key.strip()] = value.strip().strip('"')
     name = data.get("PRETTY_NAME") or data.get("NAME")
     version = data.get("VERSION")
     if name and version:
@@ -56,103 +189,165 @@ def read_os_release() -> Optional[str]:
 
 
 def parse_lscpu(raw: str) -> Dict[str, Any]:
-    cpu_info: Dict[str, Any] = {}
-    for line in raw.splitlines():
-        if ":" not in line:
-            continue
-        key, value = [segment.strip() for segment in line.split(":", 1)]
-        cpu_info[key] = value
+    cpu_info: Dict[str, Any] = dict(_LSCPU_RE.findall(raw))
     summary: Dict[str, Any] = {}
     summary["model"] = cpu_info.get("Model name") or cpu_info.get("Model") or "Unknown"
-    cores = cpu_info.get("CPU(s)")
-    if cores:
+    # Counts are reported as ints to match parse_cpuinfo; lscpu prints "-" when unknown
+    for key, field in (
+        ("cores", "CPU(s)"),
+        ("sockets", "Socket(s)"),
+        ("threads_per_core", "Thread(s) per core"),
+    ):
         try:
-            summary["cores"] = int(re.findall(r"\d+", cores)[0])
-        except (IndexError, ValueError):
-            summary["cores"] = cores
-    sockets = cpu_info.get("Socket(s)")
-    if sockets:
-        summary["sockets"] = sockets
-    threads_per_core = cpu_info.get("Thread(s) per core")
-    if threads_per_core:
-        summary["threads_per_core"] = threads_per_core
+            summary[key] = int(cpu_info[field])
+        except (KeyError, ValueError):
+            continue
     return summary
 
 
-def parse_free(raw: str) -> Dict[str, Any]:
-    lines = raw.splitlines()
-    if len(lines) < 2:
-        return {}
-    headers = re.split(r"\s+", lines[0].strip())
-    mem_line = next((line for line in lines if line.lower().startswith("mem")), None)
-    if not mem_line:
+def parse_cpuinfo(raw: str) -> Dict[str, Any]:
+    processors = 0
+    model: Optional[str] = None
+    physical_ids = set()
+    siblings: Optional[str] = None
+    cpu_cores: Optional[str] = None
+    for key, value in _CPUINFO_RE.findall(raw):
+        if key == "processor":
+            processors += 1
+        elif key == "model name" and not model:
+            model = value
+        elif key == "physical id":
+            physical_ids.add(value)
+        elif key == "siblings" and not siblings:
+            siblings = value
+        elif key == "cpu cores" and not cpu_cores:
+            cpu_cores = value
+    summary: Dict[str, Any] = {}
+    if model:
+        summary["model"] = model
+    if processors:
+        summary["cores"] = processors
+    if physical_ids:
+        summary["sockets"] = len(physical_ids)
+    if siblings and cpu_cores:
+        try:
+            threads, cores = int(siblings), int(cpu_cores)
+        except ValueError:
+            threads = cores = 0
+        # Hybrid parts (e.g. 20 siblings over 14 P+E cores) do not divide
+        # evenly; leave those to lscpu.
+        if cores and threads % cores == 0:
+            summary["threads_per_core"] = threads // cores
+    return summary
+
+
+def read_meminfo(fields: Tuple[str, ...]) -> Dict[str, int]:
+    """Return the requested /proc/meminfo fields in kB."""
+    meminfo_path = HOST_ROOT / "proc/meminfo"
+    try:
+        raw = meminfo_path.read_text()
+    except OSError:
         return {}
-    values = re.split(r"\s+", mem_line.strip())[1:]
-    memory = dict(zip(headers, values))
-    return {
-        "total": memory.get("total"),
-        "used": memory.get("used"),
-    }
+    meminfo: Dict[str, int] = {}
+    for line in raw.splitlines():
+        key, sep, value = line.partition(":")
+        if not sep or key not in fields:
+            continue
+        try:
+            meminfo[key] = int(value.split()[0])
+        except (IndexError, ValueError):
+            continue
+        # MemTotal/MemAvailable sit at the top, so skip the remaining lines
+        if len(meminfo) == len(fields):
+            break
+    return meminfo
 
 
-def human_readable_to_bytes(value: str) -> Optional[float]:
-    match = re.match(r"([\d\.]+)([KMGTP]?)(i?B)?", value)
-    if not match:
-        return None
-    number = float(match.group(1))
-    unit = match.group(2).upper() if match.group(2) else ""
-    multipliers = {
-        "": 1,
-        "K": 1024,
-        "M": 1024**2,
-        "G": 1024**3,
-        "T": 1024**4,
-        "P": 1024**5,
-    }
-    return number * multipliers.get(unit, 1)
+def format_bytes(value: float) -> str:
+    gb = value / (1024**3)
+    return f"{gb:.1f} GB"
 
 
-def format_gb(value: Optional[str]) -> Optional[str]:
-    if not value:
+def find_mount_source(mountpoint: Path) -> Optional[str]:
+    """Return the device mounted at mountpoint in this process's namespace."""
+    try:
+        raw = Path("/proc/self/mounts").read_text()
+    except OSError:
         return None
-    bytes_value = human_readable_to_bytes(value)
-    if bytes_value is None:
-        return value
-    gb = bytes_value / (1024**3)
-    return f"{gb:.1f} GB"
+    source: Optional[str] = None
+    for line in raw.splitlines():
+        fields = line.split()
+        # Later entries shadow earlier ones mounted on the same path
+        if len(fields) >= 2 and fields[1] == str(mountpoint):
+            source = fields[0]
+    return source
 
 
-def parse_storage(raw: str) -> Dict[str, Any]:
-    lines = raw.splitlines()
-    if len(lines) < 2:
-        return {}
-    headers = re.split(r"\s+", lines[0].strip())
-    values = re.split(r"\s+", lines[1].strip())
+def parse_ip_json(raw: str) -> Optional[str]:
+    """Pick an address from `ip -j a` output; raise ValueError if raw is not that."""
+    interfaces = json.loads(raw)
+    if not isinstance(interfaces, list) or not all(
+        isinstance(iface, dict) for iface in interfaces
+    ):
+        raise ValueError("ip -j a did not return a list of interfaces")
 
-    if headers[-2:] == ["Mounted", "on"]:
-        headers = headers[:-2] + ["Mounted on"]
-    if len(values) < len(headers) and "Mounted on" in headers:
-        # Join remaining parts for mountpoint
-        mount_index = headers.index("Mounted on")
-        mount_value = " ".join(values[mount_index:])
-        values = values[:mount_index] + [mount_value]
+    fallback_ip: Optional[str] = None
 
-    data = dict(zip(headers, values))
+    for iface in interfaces:
+        if str(iface.get("ifname", "")).startswith(SKIPPED_IFACE_PREFIXES):
+            continue
+        addr_info = iface.get("addr_info")
+        if not isinstance(addr_info, list):
+            continue
+        for addr in addr_info:
+            if not isinstance(addr, dict) or addr.get("family") != "inet":
+                continue
+            address = addr.get("local")
+            mask_size = addr.get("prefixlen")
+            if not isinstance(address, str) or not isinstance(mask_size, int):
+                continue
+            if address.startswith("127."):
+                continue
+            # The first /24-or-narrower address wins outright
+            if mask_size >= 24:
+                return address
+            if fallback_ip is None:
+                fallback_ip = address
 
-    filesystem = data.get("Filesystem")
-    size = format_gb(data.get("Size"))
-    used = format_gb(data.get("Used"))
-    available = format_gb(data.get("Avail"))
-    mountpoint = data.get("Mounted") or data.get("Mounted on")
+    return fallback_ip
 
-    result = {
-        "filesystem": filesystem,
-        "size": size,
-        "used": used,
-        "available": available,
-        "mountpoint": mountpoint,
-    }
-    return {key: value for key, value in result.items() if value}
+
+def parse_ip_addr(raw: str) -> Optional[str]:
+    # Decided once per interface header; lines before the first header are ignored
+    skip_iface = True
+    fallback_ip: Optional[str] = None
+
+    for line in raw.splitlines():
+        # "2: eth0@if5: <...>" starts an interface, "    inet 10.0.0.2/24 ..." an address
+        parts = line.split(None, 2)
+        if len(parts) < 2:
+            continue
+        if parts[0].endswith(":") and parts[0][:-1].isdigit():
+            iface = parts[1].rstrip(":").split("@")[0]
+            skip_iface = not iface or iface.startswith(SKIPPED_IFACE_PREFIXES)
+            continue
+        if not skip_iface and parts[0] == "inet":
+            address, _, mask = parts[1].partition("/")
+            if not mask:
+                continue
+            try:
+                mask_size = int(mask)
+            except ValueError:
+                continue
+            if address.startswith("127."):
+                continue
+            # The first /24-or-narrower address wins outright
+            if mask_size >= 24:
+                return address
+            if fallback_ip is None:
+                fallback_ip = address
+
+    return fallback_ip
 
 
 def gather_os_version() -> Optional[str]:
@@ -169,13 +364,11 @@ def gather_os_version() -> Optional[str]:
                 description = value
         if description:
             return description
-    fallback = run_host_command(["lsb_release", "-ds"])
-    if fallback:
-        return fallback.strip().strip('"')
+    # lsb_release -ds would only repeat what /etc/os-release already has
     return read_os_release()
 
 
-def gather_hostname_and_ips() -> Tuple[Optional[str], Optional[str], List[str]]:
+def gather_hostname() -> Optional[str]:
     # Read hostname directly from host filesystem
     hostname_path = HOST_ROOT / "etc/hostname"
     hostname = None
@@ -188,99 +381,260 @@ def gather_hostname_and_ips() -> Tuple[Optional[str], Optional[str], List[str]]:
     # Fallback to hostname command if file doesn't exist or is empty
     if not hostname:
         hostname = run_host_command(["hostname"])
+    return hostname
 
-    output = run_host_command(["ip", "a"])
-    if not output:
-        return hostname, None, []
-
-    current_iface: Optional[str] = None
-    preferred_ips: List[str] = []
-    fallback_ips: List[str] = []
-
-    for line in output.splitlines():
-        iface_match = re.match(r"^\d+:\s+([^:]+):", line)
-        if iface_match:
-            current_iface = iface_match.group(1).split("@")[0]
-            continue
-        if current_iface and "inet " in line:
-            if current_iface.startswith(("lo", "docker", "br-", "veth", "tun")):
-                continue
-            cidr = line.strip().split()[1]
-            address, _, mask = cidr.partition("/")
-            if not mask:
-                continue
-            try:
-                mask_size = int(mask)
-            except ValueError:
-                continue
-            if address.startswith("127."):
-                continue
-            if mask_size >= 24:
-                preferred_ips.append(address)
-            else:
-                fallback_ips.append(address)
 
+def gather_ip_addresses() -> List[str]:
     selected_ip: Optional[str] = None
-    if preferred_ips:
-        selected_ip = preferred_ips[0]
-    elif fallback_ips:
-        selected_ip = fallback_ips[0]
+    output = run_host_command(["ip", "-j", "a"])
+    try:
+        if not output:
+            raise ValueError("ip -j a produced no output")
+        selected_ip = parse_ip_json(output)
+    except ValueError:
+        # iproute2 before 4.13 and busybox ip have no JSON output, and some
+        # builds or wrappers ignore -j and print the text listing instead
+        output = run_host_command(["ip", "a"])
+        if not output:
+            return []
+        selected_ip = parse_ip_addr(output)
 
     if selected_ip:
-        return hostname, selected_ip, [selected_ip]
-    return hostname, None, []
+        return [selected_ip]
+    return []
+
+
+def gather_cpu() -> Dict[str, Any]:
+    cpuinfo_path = HOST_ROOT / "proc/cpuinfo"
+    try:
+        cpu = parse_cpuinfo(cpuinfo_path.read_text())
+    except OSError:
+        cpu = {}
+    if cpu.get("model") and "sockets" in cpu and "threads_per_core" in cpu:
+        return cpu
+
+    # Some architectures (e.g. ARM) omit the model name, physical ids or core
+    # counts from /proc/cpuinfo, and hybrid CPUs have no even threads-per-core
+    # ratio; lscpu derives these from sysfs. Values cpuinfo did provide take
+    # precedence.
+    lscpu_output = run_host_command(["lscpu"])
+    if lscpu_output:
+        return {**parse_lscpu(lscpu_output), **cpu}
+    return cpu
+
+
+def read_memory_bytes() -> Dict[str, int]:
+    meminfo = read_meminfo(("MemTotal", "MemAvailable"))
+    total = meminfo.get("MemTotal")
+    if total is None:
+        return {}
+    memory = {"total": total * 1024}
+    available = meminfo.get("MemAvailable")
+    if available is not None:
+        memory["used"] = (total - available) * 1024
+    return memory
 
 
 def gather_memory() -> Dict[str, Any]:
-    output = run_host_command(["free", "-h"])
-    if not output:
+    return {key: format_bytes(value) for key, value in read_memory_bytes().items()}
+
+
+def read_storage_bytes() -> Dict[str, int]:
+    try:
+        stats = os.statvfs(HOST_ROOT)
+    except OSError:
         return {}
-    return parse_free(output)
+    return {
+        "size": stats.f_blocks * stats.f_frsize,
+        "used": (stats.f_blocks - stats.f_bfree) * stats.f_frsize,
+        "available": stats.f_bavail * stats.f_frsize,
+    }
 
 
 def gather_storage() -> Dict[str, Any]:
-    output = run_host_command(["df", "-h", "/"])
-    if not output:
+    storage = read_storage_bytes()
+    if not storage:
         return {}
-    return parse_storage(output)
 
+    result = {
+        "filesystem": find_mount_source(HOST_ROOT),
+        "size": format_bytes(storage["size"]),
+        "used": format_bytes(storage["used"]),
+        "available": format_bytes(storage["available"]),
+        "mountpoint": "/",
+    }
+    return {key: value for key, value in result.items() if value}
 
-def gather_system_metrics() -> Dict[str, Any]:
-    metrics: Dict[str, Any] = {}
 
-    hostname, primary_ip, ips = gather_hostname_and_ips()
+def gather_static_metrics() -> Dict[str, Any]:
+    """Collect host facts that do not change after boot.
+
+    The result is kept for the life of the process only once every fact was
+    collected, so a failed read at startup is retried on the next request.
+    """
+    global _static_metrics
+    if _static_metrics is not None:
+        return _static_metrics
+
+    static: Dict[str, Any] = {}
+
+    hostname = gather_hostname()
     if hostname:
-        metrics["hostname"] = hostname
-    if ips:
-        metrics["ip_addresses"] = ips
+        static["hostname"] = hostname
 
     os_info = gather_os_version()
     if os_info:
-        metrics["operating_system"] = os_info
+        static["operating_system"] = os_info
+
+    cpu = gather_cpu()
+    if cpu:
+        static["cpu"] = cpu
+
+    if all(key in static for key in STATIC_METRIC_KEYS):
+        _static_metrics = static
+    return static
+
+
+async def gather_system_metrics() -> Dict[str, Any]:
+    # The collectors are independent and block on file/subprocess I/O, so run
+    # them side by side in the threadpool rather than one after another.
+    static, ips, memory, storage = await asyncio.gather(
+        run_in_threadpool(gather_static_metrics),
+        run_in_threadpool(gather_ip_addresses),
+        run_in_threadpool(gather_memory),
+        run_in_threadpool(gather_storage),
+    )
+    metrics: Dict[str, Any] = {}
 
-    lscpu_output = run_host_command(["lscpu"])
-    if lscpu_output:
-        metrics["cpu"] = parse_lscpu(lscpu_output)
+    if "hostname" in static:
+        metrics["hostname"] = static["hostname"]
+
+    if ips:
+        metrics["ip_addresses"] = ips
+
+    if "operating_system" in static:
+        metrics["operating_system"] = static["operating_system"]
+
+    if "cpu" in static:
+        metrics["cpu"] = static["cpu"]
 
-    memory = gather_memory()
     if memory:
         metrics["memory"] = memory
 
-    storage = gather_storage()
     if storage:
         metrics["storage"] = storage
 
     return metrics
 
 
+async def cached_payload(
+    key: str, gather: Callable[[], Awaitable[Dict[str, Any]]]
+) -> Tuple[float, str, Dict[str, Any]]:
+    """Return (expires_at, etag, payload), re-gathering at most once per METRICS_MAX_AGE."""
+    entry = _metrics_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry
+
+    async with _metrics_cache_locks.setdefault(key, asyncio.Lock()):
+        # Another request may have refreshed the entry while this one waited
+        entry = _metrics_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry
+
+        data = await gather()
+        if not data:
+            raise HTTPException(status_code=500, detail="Unable to collect system metrics")
+        digest = hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        entry = (time.monotonic() + METRICS_MAX_AGE, f'"{digest[:16]}"', data)
+        _metrics_cache[key] = entry
+        return entry
+
+
+def cache_control(expires_at: float) -> str:
+    # Advertise only the lifetime left on the cached entry
+    return f"max-age={max(0, math.ceil(expires_at - time.monotonic()))}"
+
+
 @app.get("/metrics")
-def metrics() -> Dict[str, Any]:
-    data = gather_system_metrics()
-    if not data:
-        raise HTTPException(status_code=500, detail="Unable to collect system metrics")
+async def metrics(request: Request, response: Response) -> Any:
+    expires_at, etag, data = await cached_payload("json", gather_system_metrics)
+    headers = {"Cache-Control": cache_control(expires_at), "ETag": etag}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
     return data
 
 
+def prometheus_label(value: Any) -> str:
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+def format_prometheus(
+    static: Dict[str, Any],
+    ips: List[str],
+    memory: Dict[str, int],
+    storage: Dict[str, int],
+) -> str:
+    """Render collected metrics in the Prometheus text exposition format."""
+    lines: List[str] = []
+
+    def gauge(name: str, help_text: str, value: Any, labels: str = "") -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name}{labels} {value}")
+
+    info = {
+        "hostname": static.get("hostname"),
+        "operating_system": static.get("operating_system"),
+        "cpu_model": static.get("cpu", {}).get("model"),
+        "ip_address": ips[0] if ips else None,
+    }
+    labels = ",".join(
+        f"{key}={prometheus_label(value)}" for key, value in info.items() if value
+    )
+    gauge("system_info", "Static host information.", 1, f"{{{labels}}}" if labels else "")
+
+    cores = static.get("cpu", {}).get("cores")
+    if isinstance(cores, int):
+        gauge("system_cpu_cores", "Number of logical CPUs.", cores)
+    for key in ("total", "used"):
+        if key in memory:
+            gauge(f"system_memory_{key}_bytes", f"Host memory {key} in bytes.", memory[key])
+    for key in ("size", "used", "available"):
+        if key in storage:
+            gauge(
+                f"system_storage_{key}_bytes",
+                f"Host root filesystem {key} in bytes.",
+                storage[key],
+            )
+
+    return "\n".join(lines) + "\n"
+
+
+async def gather_prometheus_metrics() -> Dict[str, Any]:
+    static, ips, memory, storage = await asyncio.gather(
+        run_in_threadpool(gather_static_metrics),
+        run_in_threadpool(gather_ip_addresses),
+        run_in_threadpool(read_memory_bytes),
+        run_in_threadpool(read_storage_bytes),
+    )
+    if not (static or ips or memory or storage):
+        return {}
+    return {"static": static, "ips": ips, "memory": memory, "storage": storage}
+
+
+@app.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
+    expires_at, _, data = await cached_payload("prometheus", gather_prometheus_metrics)
+    return PlainTextResponse(
+        format_prometheus(data["static"], data["ips"], data["memory"], data["storage"]),
+        media_type="text/plain; version=0.0.4",
+        headers={"Cache-Control": cache_control(expires_at)},
+    )
+
+
 @app.get("/healthz")
 def healthz() -> Dict[str, str]:
     return {"status": "ok"}